@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Decode robot telemetry logs (.tlm) into CSV and plots for notebook entries."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+MAGIC = b"5840TLM1"
+HEADER_SIZE = len(MAGIC) + 6
+
+# Panels drawn for each log; a field lands in the first panel whose test matches its name.
+PLOT_PANELS = (
+    ("Driver input (%)", lambda name: name.startswith("axis")),
+    ("Commanded vs actual speed (%)", lambda name: name.endswith("_cmd") or name.endswith("_vel_pct")),
+    ("Motor current (A)", lambda name: name.endswith("_current_a")),
+)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+  logging.basicConfig(level=os.environ.get("NOTEBOOK_LOG_LEVEL", "INFO"), format="[%(levelname)s] %(message)s")
+  log = logging.getLogger("telemetry")
+
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("logs", nargs="+", type=Path, help="Telemetry files copied off the brain's SD card")
+  parser.add_argument("--output", type=Path,
+                      help="Directory for the CSV/PNG files (default: next to each log). "
+                           "Point this at an entry's resources folder to reference the plots from its JSON.")
+  parser.add_argument("--skip-plot", action="store_true", help="Only write CSV; skip the matplotlib plot")
+  parser.add_argument("--title", help="Plot title (default: the log's file name)")
+  args = parser.parse_args(list(argv) if argv is not None else None)
+
+  for log_path in args.logs:
+    data = read_log(log_path)
+    out_dir = (args.output or log_path.parent).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = out_dir / f"{log_path.stem}.csv"
+    write_csv(data, csv_path)
+    log.info("Decoded %s: %d samples over %.1f s -> %s", log_path, len(data), data.duration_s, csv_path)
+    if not args.skip_plot:
+      png_path = out_dir / f"{log_path.stem}.png"
+      plot_log(data, png_path, args.title or log_path.stem)
+      log.info("Wrote plot to %s", png_path)
+  return 0
+
+
+@dataclass
+class TelemetryLog:
+  fields: List[str]
+  columns: Dict[str, List[float]]
+
+  def __len__(self) -> int:
+    return len(next(iter(self.columns.values()), []))
+
+  @property
+  def duration_s(self) -> float:
+    times = self.columns.get("time_s") or [0.0]
+    return times[-1] - times[0]
+
+
+def read_log(path: Path) -> TelemetryLog:
+  raw = Path(path).read_bytes()
+  if not raw.startswith(MAGIC) or len(raw) < HEADER_SIZE:
+    raise ValueError(f"{path} is not a telemetry log")
+  field_count = int.from_bytes(raw[8:10], "little")
+  sample_count = int.from_bytes(raw[10:12], "little")
+  names_len = int.from_bytes(raw[12:14], "little")
+  specs = raw[HEADER_SIZE:HEADER_SIZE + names_len].decode("utf-8").split(",")
+  if len(specs) != field_count:
+    raise ValueError(f"{path}: header lists {len(specs)} fields, expected {field_count}")
+
+  fields: List[str] = []
+  scales: List[float] = []
+  wrapping: List[bool] = []
+  for spec in specs:
+    name, _, rest = spec.partition("/")
+    scale, _, flag = rest.partition("/")
+    fields.append(name)
+    scales.append(float(scale or 1))
+    wrapping.append(flag == "wrap")
+
+  body = raw[HEADER_SIZE + names_len:]
+  sample_size = 2 * field_count
+  if len(body) < sample_size * sample_count:
+    raise ValueError(f"{path} is truncated: expected {sample_count} samples")
+  # The brain writes little-endian int16 samples.
+  values = array("h", body[:sample_size * sample_count])
+  if sys.byteorder == "big":
+    values.byteswap()
+
+  columns: Dict[str, List[float]] = {name: [] for name in fields}
+  for offset, name in enumerate(fields):
+    raw_values = values[offset::field_count]
+    if wrapping[offset]:
+      raw_values = unwrap_counter(raw_values)
+    columns[name] = [value * scales[offset] for value in raw_values]
+  return TelemetryLog(fields=fields, columns=columns)
+
+
+def unwrap_counter(values: Iterable[int]) -> List[int]:
+  """Undo the 16 bit roll-over of a counter stored with "/wrap"; it only ever counts up."""
+  unwrapped: List[int] = []
+  base = 0
+  previous = None
+  for value in values:
+    value &= 0xFFFF  # stored as int16, the counter itself is unsigned
+    if previous is not None and value < previous:
+      base += 0x10000
+    previous = value
+    unwrapped.append(base + value)
+  return unwrapped
+
+
+def write_csv(data: TelemetryLog, csv_path: Path) -> None:
+  with csv_path.open("w", newline="", encoding="utf-8") as handle:
+    writer = csv.writer(handle)
+    writer.writerow(data.fields)
+    for row in zip(*(data.columns[name] for name in data.fields)):
+      writer.writerow([f"{value:g}" for value in row])
+
+
+def plot_log(data: TelemetryLog, png_path: Path, title: str) -> None:
+  try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+  except ImportError as exc:
+    raise RuntimeError("matplotlib is not installed. Run 'pip install -r compilation/requirements.txt' or pass --skip-plot.") from exc
+
+  panels = []
+  for label, matches in PLOT_PANELS:
+    names = [name for name in data.fields if name != "time_s" and matches(name)]
+    if names:
+      panels.append((label, names))
+  if not panels:
+    raise ValueError("Telemetry log has no fields to plot")
+
+  times = data.columns.get("time_s") or list(range(len(data)))
+  fig, axes = plt.subplots(len(panels), 1, sharex=True, figsize=(10, 3 * len(panels)), squeeze=False)
+  for ax, (label, names) in zip(axes[:, 0], panels):
+    for name in names:
+      ax.plot(times, data.columns[name], label=name, linewidth=1)
+    ax.set_ylabel(label)
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc="upper right", fontsize="small", ncol=2)
+  axes[-1, 0].set_xlabel("Time (s)")
+  fig.suptitle(title)
+  fig.tight_layout()
+  fig.savefig(png_path, dpi=120)
+  plt.close(fig)
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
@@ -5,6 +5,9 @@ from __future__ import annotations
 
 import argparse
 import calendar
+import contextlib
+import gzip
+import hashlib
 import html
 import json
 import logging
@@ -16,7 +19,7 @@ from datetime import datetime
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
-from urllib.parse import quote
+from urllib.parse import quote, unquote
 
 from bs4 import BeautifulSoup
 from jinja2 import Environment, FileSystemLoader, select_autoescape
@@ -48,6 +51,10 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
   parser.add_argument("--skip-pdf", action="store_true", help="Only emit HTML; skip PDF generation")
   parser.add_argument("--pdf-path", type=Path, help="Custom path for the generated PDF")
   parser.add_argument("--html-path", type=Path, help="Custom path for the generated HTML")
+  parser.add_argument("--merge-pdfs", action="store_true",
+                      help="Splice PDFs referenced by entries into the notebook PDF right after their entry")
+  parser.add_argument("--bundles", action="store_true",
+                      help="Also write content-hashed per-month entry bundles for the site interpreter")
   args = parser.parse_args(list(argv) if argv is not None else None)
 
   output_dir = args.output.resolve()
@@ -73,26 +80,44 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
 
   toc = build_toc(months)
   log.info("Rendering notebook: %d months, %d total entries", len(months), sum(len(m["entries"]) for m in months))
+  generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
   html_text = template.render(
       meta={
           "title": "Team 5840C Engineering Notebook",
-          "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+          "generated": generated,
       },
       base_href=base_href,
       vex_logo=encode_local_href(VEX_LOGO_PATH),
       home_content=home_content,
       months=months,
       toc=toc,
+      merge_pdfs=args.merge_pdfs and not args.skip_pdf,
   )
 
   html_path = (args.html_path.resolve() if args.html_path else output_dir / "notebook.html")
   html_path.write_text(html_text, encoding="utf-8")
   log.info("Wrote HTML notebook to %s (%.1f KB)", html_path, html_path.stat().st_size / 1024)
+
+  if args.bundles:
+    write_bundles(manifest, assets, output_dir / "bundles", log)
   assets.report()
 
   if not args.skip_pdf:
     pdf_path = (args.pdf_path.resolve() if args.pdf_path else output_dir / "notebook.pdf")
+    if args.merge_pdfs:
+      # The timestamp changes every run; leave it out so an unchanged notebook hits the cache.
+      cached = merged_pdf_cache_path(output_dir / "pdf-cache", html_text.replace(generated, ""), months, assets)
+      if cached.exists():
+        shutil.copyfile(cached, pdf_path)
+        log.info("Notebook and attachments unchanged; reused %s (skipped printing)", cached)
+        return 0
     generate_pdf(html_path, pdf_path, log)
+    if args.merge_pdfs:
+      merge_pdf_attachments(pdf_path, months, toc, log)
+      cached.parent.mkdir(parents=True, exist_ok=True)
+      for stale in cached.parent.glob("notebook-*.pdf"):
+        stale.unlink()
+      shutil.copyfile(pdf_path, cached)
 
   return 0
 
@@ -206,6 +231,11 @@ def extract_home_content(index_path: Path, assets: "AssetManager") -> str:
 
 
 def load_entry(month_name: str, entry_meta: Dict[str, Any], assets: "AssetManager") -> Dict[str, Any]:
+  data, ctx = read_entry_page(month_name, entry_meta)
+  return build_entry(data, ctx, assets)
+
+
+def read_entry_page(month_name: str, entry_meta: Dict[str, Any]) -> tuple:
   entry_id = entry_meta.get("id")
   if not entry_id:
     raise ValueError(f"Entry in {month_name} missing 'id'")
@@ -216,7 +246,7 @@ def load_entry(month_name: str, entry_meta: Dict[str, Any], assets: "AssetManage
 
   data = json.loads(entry_path.read_text(encoding="utf-8"))
   ctx = {"cls": month_name, "id": entry_id}
-  return build_entry(data, ctx, assets)
+  return data, ctx
 
 
 def build_entry(page: Dict[str, Any], ctx: Dict[str, str], assets: "AssetManager") -> Dict[str, Any]:
@@ -238,8 +268,15 @@ def build_entry(page: Dict[str, Any], ctx: Dict[str, str], assets: "AssetManager
       process_element(el, page, ctx, assets)
       for el in elements
   ]
+  processed_elements = [el for el in processed_elements if el is not None]
 
   anchor = slugify(f"{ctx['cls']}-{title}-{page.get('date', id_str)}")
+  # Local PDFs that --merge-pdfs splices into the printed notebook after this entry.
+  pdf_attachments = [
+      {"label": item["label"], "path": item["path"]}
+      for el in processed_elements if el["template"] == "pdf"
+      for item in el["items"] if item.get("path")
+  ]
 
   return {
       "anchor": anchor,
@@ -247,7 +284,8 @@ def build_entry(page: Dict[str, Any], ctx: Dict[str, str], assets: "AssetManager
       "date": page.get("date", ""),
       "type": page.get("type", ""),
       "brief": brief,
-      "elements": [el for el in processed_elements if el is not None],
+      "elements": processed_elements,
+      "pdf_attachments": pdf_attachments,
   }
 
 
@@ -343,10 +381,12 @@ def process_element(el: Dict[str, Any], page: Dict[str, Any], ctx: Dict[str, str
       if not resolved.href:
         continue
       filename = Path(item.get("src") or "").name
+      local = resolved.fs_path and resolved.fs_path.exists() and resolved.fs_path.suffix.lower() == ".pdf"
       items_data.append({
           "label": item.get("label") or "PDF",
           "filename": filename,
           "src": resolved.href,
+          "path": resolved.fs_path.relative_to(REPO_ROOT).as_posix() if local else "",
       })
     if not items_data:
       return None
@@ -542,6 +582,10 @@ class AssetManager:
     self._image_cache[source] = href
     return href
 
+  def referenced_files(self) -> List[Path]:
+    """Exported files this run handed out hrefs for, in a stable order."""
+    return sorted({REPO_ROOT / unquote(href) for href in self._image_cache.values()})
+
   def report(self) -> None:
     if self._images_processed or self._images_copied:
       total_images = self._images_processed + self._images_copied
@@ -639,6 +683,237 @@ def first_truthy(*values: Any) -> Any:
   return ""
 
 
+def write_bundles(manifest: Dict[str, Any], assets: "AssetManager", bundle_dir: Path, log: logging.Logger) -> Dict[str, Any]:
+  """Write one content-hashed JSON bundle per month, plus gzip/brotli siblings.
+
+  Each bundle holds the raw page JSON (what js/interpreter.js renders) and a
+  map of image paths to their resized variants. The variants are copied into bundles/images/ and referenced
+  relative to the bundle folder, so publishing that one folder is enough.
+  Bundle names change whenever their content does, so they can be served with
+  an immutable cache policy; only bundles/index.json is mutable.
+  """
+  try:
+    import brotli  # type: ignore
+  except ImportError:
+    brotli = None
+    log.info("brotli not installed; writing gzip bundles only")
+
+  bundle_dir.mkdir(parents=True, exist_ok=True)
+  index: Dict[str, Any] = {}
+  for month_name, entries_meta in manifest.items():
+    entries: Dict[str, Any] = {}
+    for entry_meta in entries_meta:
+      page, ctx = read_entry_page(month_name, entry_meta)
+      entries[ctx["id"]] = {
+          "page": page,
+          "variants": collect_image_variants(page, ctx, assets, bundle_dir),
+      }
+
+    payload = json.dumps({"month": month_name, "entries": entries},
+                         ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    stem = slugify(month_name)
+    name = f"{stem}.{digest}.json"
+
+    for stale in bundle_dir.glob(f"{stem}.*.json*"):
+      if not stale.name.startswith(name):
+        stale.unlink()
+
+    target = bundle_dir / name
+    if not target.exists():
+      target.write_bytes(payload)
+      # mtime=0 keeps the gzip output byte-identical across runs.
+      (bundle_dir / f"{name}.gz").write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+      if brotli is not None:
+        (bundle_dir / f"{name}.br").write_bytes(brotli.compress(payload, quality=11))
+      log.debug("Wrote bundle %s (%.1f KB)", target, len(payload) / 1024)
+
+    index[month_name] = {"file": name, "entries": sorted(entries)}
+
+  index_path = bundle_dir / "index.json"
+  index_path.write_text(json.dumps(index, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+  log.info("Wrote %d entry bundles to %s", len(index), bundle_dir)
+  return index
+
+
+def collect_image_variants(page: Dict[str, Any], ctx: Dict[str, str], assets: "AssetManager",
+                           bundle_dir: Path) -> Dict[str, str]:
+  variants: Dict[str, str] = {}
+  for el in page.get("elements") if isinstance(page.get("elements"), list) else []:
+    if not isinstance(el, dict) or normalize_type(el.get("type")) not in {"image", "images"}:
+      continue
+    for item in normalize_items(el):
+      resolved = resolve_src(item.get("src"), page, ctx)
+      if not resolved.href or is_http(resolved.href):
+        continue
+      variant = assets.prepare_image(resolved)
+      if not variant or variant == resolved.href:
+        continue
+      variant_fs = REPO_ROOT / unquote(variant)
+      try:
+        rel = variant_fs.relative_to(assets.assets_dir)
+      except ValueError:
+        continue
+      target = bundle_dir / "images" / rel
+      if not target.exists() or target.stat().st_mtime < variant_fs.stat().st_mtime:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(variant_fs, target)
+      # Keyed by the expanded (unencoded) path so the interpreter can match it.
+      variants[expand_template_path(item.get("src"), page, ctx).lstrip("/")] = encode_local_href(
+          target.relative_to(bundle_dir).as_posix())
+  return variants
+
+
+def pdf_attachment_plan(months: List[Dict[str, Any]]) -> List[tuple]:
+  return [
+      (entry, attachment)
+      for month in months
+      for entry in month["entries"]
+      for attachment in entry["pdf_attachments"]
+  ]
+
+
+def merged_pdf_cache_path(cache_dir: Path, html_text: str, months: List[Dict[str, Any]],
+                          assets: "AssetManager") -> Path:
+  """Cache file for a merged notebook, keyed on everything that goes into printing it.
+
+  That is the rendered HTML (without its timestamp), the stylesheets and
+  exported images it links to, and every attachment with the entry it
+  follows. The key is known before printing, so a hit skips Chromium too.
+  """
+  digest = hashlib.sha256(html_text.encode("utf-8"))
+  stylesheets = [REPO_ROOT / "css" / "style.css", REPO_ROOT / "compilation" / "notebook.css"]
+  for path in [*stylesheets, *assets.referenced_files()]:
+    if path.exists():
+      digest.update(f"\0{path.relative_to(REPO_ROOT).as_posix()}\0{file_digest(path)}".encode())
+  for entry, attachment in pdf_attachment_plan(months):
+    digest.update(f"\0{entry['anchor']}\0{attachment['label']}\0".encode())
+    digest.update(file_digest(REPO_ROOT / attachment["path"]).encode())
+  return cache_dir / f"notebook-{digest.hexdigest()[:16]}.pdf"
+
+
+def merge_pdf_attachments(pdf_path: Path, months: List[Dict[str, Any]], toc: List[Dict[str, Any]],
+                          log: logging.Logger) -> None:
+  """Insert each entry's local PDF attachments after the entry's last page.
+
+  pikepdf (qpdf) copies attachment pages lazily: stream data stays in the
+  source files until the merged document is written, so large attachments
+  are never decoded or held in memory as a whole. Attachments that are not
+  readable PDFs are skipped with a warning.
+  """
+  plan = pdf_attachment_plan(months)
+  if not plan:
+    log.info("No local PDF attachments to merge.")
+    return
+
+  try:
+    import pikepdf
+  except ImportError as exc:
+    raise RuntimeError("pikepdf is not installed. Run 'pip install -r compilation/requirements.txt'.") from exc
+
+  # Document order of every anchor the TOC links to; an entry ends where the next one starts.
+  anchors = [item["anchor"] for top in toc for item in [top, *top["children"]]]
+  merged_path = pdf_path.with_name(f"{pdf_path.stem}.merging.pdf")
+  with contextlib.ExitStack() as sources, pikepdf.open(pdf_path) as notebook:
+    anchor_pages = find_anchor_pages(notebook, anchors)
+    page_count = len(notebook.pages)
+    placements = []
+    for entry, attachment in plan:
+      following = [anchor_pages[a] for a in anchors[anchors.index(entry["anchor"]) + 1:] if a in anchor_pages]
+      if entry["anchor"] in anchor_pages:
+        insert_at = following[0] if following else page_count
+      else:
+        log.warning("Could not locate entry %r in the PDF; appending its attachments at the end", entry["title"])
+        insert_at = page_count
+      placements.append((insert_at, entry, attachment))
+    # Stable sort keeps several attachments for one entry in their listed order.
+    placements.sort(key=lambda placement: placement[0])
+
+    bookmarks = []
+    inserted = 0
+    for insert_at, entry, attachment in placements:
+      position = insert_at + inserted
+      try:
+        source = sources.enter_context(pikepdf.open(REPO_ROOT / attachment["path"]))
+      except pikepdf.PdfError as exc:
+        log.warning("Skipping PDF attachment %s of %r: %s", attachment["path"], entry["title"], exc)
+        continue
+      bookmarks.append((f"{entry['title']} — {attachment['label']}", position))
+      for offset, page in enumerate(source.pages):
+        notebook.pages.insert(position + offset, page)
+      inserted += len(source.pages)
+      log.debug("Spliced %s (%d pages) after %s", attachment["path"], len(source.pages), entry["title"])
+
+    with notebook.open_outline() as outline:
+      for title, page_index in bookmarks:
+        outline.root.append(pikepdf.OutlineItem(title, page_index))
+    notebook.save(merged_path)
+
+  os.replace(merged_path, pdf_path)
+  log.info("Merged %d PDF attachments into %s (%.1f MB)", len(bookmarks), pdf_path, pdf_path.stat().st_size / (1024 * 1024))
+
+
+def find_anchor_pages(pdf: Any, anchors: List[str]) -> Dict[str, int]:
+  """Map HTML anchors to 0-based page indexes in a Chromium-printed PDF.
+
+  Named destinations are used when Chromium emitted them; otherwise the
+  table of contents' internal links are matched to ``anchors`` in order.
+  """
+  import pikepdf
+
+  page_index = {page.obj.objgen: idx for idx, page in enumerate(pdf.pages)}
+
+  def dest_page(dest: Any) -> Optional[int]:
+    if isinstance(dest, pikepdf.Dictionary):
+      dest = dest.get("/D")
+    if isinstance(dest, (pikepdf.String, pikepdf.Name)):
+      dest = named.get(str(dest).lstrip("/"))
+    if isinstance(dest, pikepdf.Array) and len(dest) and isinstance(dest[0], pikepdf.Dictionary):
+      return page_index.get(dest[0].objgen)
+    return None
+
+  named: Dict[str, Any] = {}
+  if "/Dests" in pdf.Root:
+    for key, value in pdf.Root.Dests.items():
+      named[key.lstrip("/")] = value
+  if "/Names" in pdf.Root and "/Dests" in pdf.Root.Names:
+    for key, value in pikepdf.NameTree(pdf.Root.Names.Dests).items():
+      named[key] = value
+
+  pages: Dict[str, int] = {}
+  for anchor in anchors:
+    if anchor in named:
+      idx = dest_page(named[anchor])
+      if idx is not None:
+        pages[anchor] = idx
+  if len(pages) == len(anchors):
+    return pages
+
+  internal_links = []
+  for page in pdf.pages:
+    for annot in page.obj.get("/Annots", []):
+      if annot.get("/Subtype") != "/Link":
+        continue
+      action = annot.get("/A")
+      target = annot.get("/Dest")
+      if target is None and action is not None and action.get("/S") == "/GoTo":
+        target = action.get("/D")
+      if target is not None:
+        internal_links.append(dest_page(target))
+  for anchor, idx in zip(anchors, internal_links):
+    if idx is not None:
+      pages.setdefault(anchor, idx)
+  return pages
+
+
+def file_digest(path: Path) -> str:
+  digest = hashlib.sha256()
+  with Path(path).open("rb") as handle:
+    for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
 def generate_pdf(html_path: Path, pdf_path: Path, log: logging.Logger) -> None:
   try:
     from playwright.sync_api import sync_playwright
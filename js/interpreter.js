@@ -6,6 +6,8 @@
   const REPO  = window.REPO_NAME;
   const BR    = window.REPO_BRANCH || "main";
   const CLASSES = Array.isArray(window.CLASSES) ? window.CLASSES : [];
+  // Optional: folder holding bundles/index.json from `npm run notebook:bundles`
+  const BUNDLES = window.ENTRY_BUNDLES ? normalizeBase(window.ENTRY_BUNDLES) : "";
 
   // Tweak this if you want bigger or smaller PDF text later
   const PDF_ZOOM = "100"; // percent. Alternatives that often work: "page-width", "175"
@@ -23,11 +25,30 @@
       return;
     }
 
+    const bundled = BUNDLES ? await fetchFromBundle(cls, id).catch(() => null) : null;
+    if (bundled) {
+      render(bundled.page, { cls, id, variants: bundled.variants || {} });
+      return;
+    }
+
     const jsonUrl = buildJsonUrl(cls, id);
     const page = await fetchJson(jsonUrl);
     render(page, { cls, id });
   }
 
+  // Bundle names are content-hashed, so only the small index needs revalidating;
+  // the bundle itself comes straight from the HTTP cache after the first visit.
+  async function fetchFromBundle(cls, id) {
+    const ir = await fetch(`${BUNDLES}index.json`, { cache: "no-cache" });
+    if (!ir.ok) return null;
+    const info = (await ir.json())[cls];
+    if (!info || !Array.isArray(info.entries) || !info.entries.includes(id)) return null;
+    const br = await fetch(BUNDLES + encodeURIComponent(info.file), { cache: "force-cache" });
+    if (!br.ok) return null;
+    const bundle = await br.json();
+    return (bundle.entries && bundle.entries[id]) || null;
+  }
+
   // Supports ?class=DE&id=... and pretty URLs /eng-portfolio/DE/<id>
   function parseRoute() {
     const sp = new URLSearchParams(location.search);
@@ -218,7 +239,7 @@
       const items = normalizeItems(el);
       let describedCount = 0; // alternate only across described images
       const content = items.map((it) => {
-        const src = makeSrc(it.src, page, ctx);
+        const { src, fallback } = makeImageSrc(it.src, page, ctx);
         const label = escapeHtml(it.label || "Image");
         const alt = escapeHtml(it.alt || it.label || page.title || "");
         const desc = it.description ? String(it.description) : "";
@@ -227,7 +248,7 @@
           const alignLeft = (describedCount % 2) === 0; // alternate L/R
           describedCount++;
           const alignClass = alignLeft ? "align-left" : "align-right";
-          const img = `<img class="image-frame" src="${src}" alt="${alt}" loading="lazy">`;
+          const img = imageTag(src, fallback, alt);
           const text = `<div class="image-desc">${richText(desc)}</div>`;
           return `<figure class="media media-described ${alignClass}">
                     <figcaption class="media-caption">${label}</figcaption>
@@ -236,7 +257,7 @@
         }
 
         // no description: render as before
-        const img = `<img class="image-frame" src="${src}" alt="${alt}" loading="lazy">`;
+        const img = imageTag(src, fallback, alt);
         return `<figure class="media">
                   <figcaption class="media-caption">${label}</figcaption>
                   <div class="media-center">${img}</div>
@@ -302,6 +323,19 @@
     if (isHttp(expanded)) return expanded;
     return BASE + encodeLocalPath(expanded);
   }
+  // Prefer the resized variant from a bundle when one exists; keep the original as a fallback
+  function makeImageSrc(p, page, ctx) {
+    const original = makeSrc(p, page, ctx);
+    const key = expandTemplatePath(p, page, ctx).replace(/^\/+/, "");
+    const variant = ctx.variants && ctx.variants[key];
+    return variant ? { src: BUNDLES + variant, fallback: original } : { src: original, fallback: "" };
+  }
+  function imageTag(src, fallback, alt) {
+    const onError = fallback
+      ? ` data-fallback="${escapeHtml(fallback)}" onerror="this.onerror=null;this.src=this.dataset.fallback"`
+      : "";
+    return `<img class="image-frame" src="${src}" alt="${alt}" loading="lazy"${onError}>`;
+  }
   async function hydrateCodeBlocks(root) {
     const list = Array.from(root.querySelectorAll('pre.code-window[data-src]'));
     await Promise.all(list.map(async (pre) => {
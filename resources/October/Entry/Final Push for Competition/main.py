@@ -26,6 +26,260 @@ REVERSE_LEFT: bool = False
 SUCTION_MOTOR: Motor = Motor(Ports.PORT9)
 SUCTION_POWER: int = 100  # percent
 
+# joystick readings closer to center than this are treated as 0, so stick noise doesn't count as movement
+DEADBAND: int = 5  # percent
+# how long the driver loop sleeps each tick
+LOOP_DELAY_MS: int = 20
+
+# last thing we told each motor to do, so we only talk to a motor when that changes
+STOPPED = "stopped"
+last_commands: dict = {}
+# last joystick position we acted on, None until the first tick
+last_sticks = None
+
+# drive response curves, set False to drive with the plain linear mix instead
+USE_RESPONSE_CURVES: bool = True
+# 0 is linear, 1 is fully cubic (fine control near center, full speed at the edge)
+DRIVE_EXPO: float = 0.4
+TURN_EXPO: float = 0.6
+# most the commanded speed can build up in one tick, in percent (0 turns it off)
+SLEW_RATE: int = 10
+# most the commanded speed can drop in one tick, in percent (0 means stop as fast as the driver lets go)
+DECEL_RATE: int = 0
+# fixed point scale used to normalize the mix without dividing
+SCALE_BITS: int = 16
+SCALE_HALF: int = 1 << (SCALE_BITS - 1)  # added before shifting so we round instead of truncating
+
+
+def command_motor(motor: Motor, direction, speed: int | float):
+    """Spin a motor, but only if it isn't already spinning that way at that speed."""
+    command = (direction, speed)
+    if last_commands.get(motor) == command:
+        return  # nothing changed, save the smart port the traffic
+    last_commands[motor] = command
+    motor.spin(direction, speed, PERCENT)
+
+
+def stop_motor(motor: Motor):
+    """Stop a motor, but only if it isn't already stopped."""
+    if last_commands.get(motor) == STOPPED:
+        return
+    last_commands[motor] = STOPPED
+    motor.stop()
+
+
+def reset_motor_state():
+    """Forget what we last told the motors.
+
+    VEXos stops every motor when the robot is disabled, so at the start of a period
+    the old commands are stale and the next command has to actually be sent.
+    """
+    global last_sticks, right_output, left_output, suction_output
+    last_commands.clear()
+    last_sticks = None
+    # the slew limiter starts from a standstill again too
+    right_output = 0
+    left_output = 0
+    suction_output = 0
+
+
+def apply_deadband(value: int | float) -> int | float:
+    """Snap small joystick values to 0."""
+    return 0 if abs(value) < DEADBAND else value
+
+
+def build_curve_table(expo: float, deadzone: int) -> list[int]:
+    """Precompute the shaped output for every joystick value from -100 to 100."""
+    table = []
+    for raw in range(-100, 101):
+        magnitude = abs(raw)
+        if magnitude < deadzone:
+            table.append(0)
+            continue
+        # rescale so the curve starts right at the edge of the deadzone
+        t = (magnitude - deadzone) / (100 - deadzone)
+        shaped = (1 - expo) * t + expo * t ** 3
+        table.append(round(shaped * 100) if raw > 0 else -round(shaped * 100))
+    return table
+
+
+def build_scale_table() -> list[int]:
+    """Precompute 100 / m in fixed point for every mix magnitude m from 0 to 200."""
+    return [(100 << SCALE_BITS) // m if m > 100 else 1 << SCALE_BITS for m in range(201)]
+
+
+# done once at startup so the driver loop is only lookups and integer math
+DRIVE_TABLE: list[int] = build_curve_table(DRIVE_EXPO, DEADBAND)
+TURN_TABLE: list[int] = build_curve_table(TURN_EXPO, DEADBAND)
+SCALE_TABLE: list[int] = build_scale_table()
+RIGHT_DIRECTION = FORWARD if not REVERSE_RIGHT else REVERSE
+LEFT_DIRECTION = FORWARD if not REVERSE_LEFT else REVERSE
+# what each side is currently being told to do, for slew limiting
+right_output: int = 0
+left_output: int = 0
+suction_output: int = 0
+
+# telemetry: every field is a 16 bit int, "name/scale" tells the decoder how to turn it back into units
+# ("/wrap" marks a counter that rolls over at 65536, the decoder unrolls it)
+TELEMETRY_FIELDS: list[str] = [
+    "time_s/0.01/wrap", "axis1/1", "axis3/1",
+    "right_cmd/1", "left_cmd/1", "suction_cmd/1",
+    "right1_vel_pct/0.1", "right2_vel_pct/0.1", "left1_vel_pct/0.1", "left2_vel_pct/0.1", "suction_vel_pct/0.1",
+    "right1_current_a/0.001", "right2_current_a/0.001", "left1_current_a/0.001", "left2_current_a/0.001",
+    "suction_current_a/0.001",
+]
+TELEMETRY_SAMPLES: int = 6000  # a bit over 2 minutes at 20 ms per tick, enough for a whole driver period
+TELEMETRY_MOTORS: list[Motor] = RIGHT_MOTORS + LEFT_MOTORS + [SUCTION_MOTOR]
+# velocity() is in each motor's own frame, flip the reversed side so it lines up with right_cmd/left_cmd
+TELEMETRY_VELOCITIES: list[tuple[Motor, int]] = (
+    [(motor, -1 if REVERSE_RIGHT else 1) for motor in RIGHT_MOTORS]
+    + [(motor, -1 if REVERSE_LEFT else 1) for motor in LEFT_MOTORS]
+    + [(SUCTION_MOTOR, 1)]
+)
+
+
+class Telemetry:
+    """Ring buffer of fixed width samples, allocated once and saved to the SD card in one go."""
+
+    MAGIC = b"5840TLM1"
+
+    def __init__(self, fields: list[str], capacity: int):
+        self.fields = fields
+        self.names = ",".join(fields).encode()
+        self.sample_size = 2 * len(fields)  # bytes, 16 bits per field
+        self.capacity = capacity
+        # the only big allocation, everything after this writes into it in place
+        self.buffer = bytearray(self.sample_size * capacity)
+        self.head = 0  # sample slot the next sample goes in
+        self.count = 0  # how many slots hold real samples
+        self.cursor = 0  # byte position inside the sample being written
+        self.saved = 0  # how many logs we've written, for file names
+        self.period = "driver"  # which period the newest samples came from
+        # samples from before the current period that haven't been saved yet (the oldest ones in the buffer)
+        self.previous_period = ""
+        self.previous_count = 0
+
+    def begin_sample(self):
+        self.cursor = self.head * self.sample_size
+
+    def put(self, value: int):
+        """Write one field of the current sample (clamped to 16 bits, little endian)."""
+        if value > 32767:
+            value = 32767
+        elif value < -32768:
+            value = -32768
+        self.put_wrapped(value)
+
+    def put_wrapped(self, value: int):
+        """Write the low 16 bits of value, for counters that are allowed to roll over."""
+        self.buffer[self.cursor] = value & 0xFF
+        self.buffer[self.cursor + 1] = (value >> 8) & 0xFF
+        self.cursor += 2
+
+    def end_sample(self):
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        elif self.previous_count:
+            self.previous_count -= 1  # just wrote over the oldest sample of the last period
+
+    def start_period(self, period: str):
+        """Record under the new period's name.
+
+        Nothing is written here, so a period never starts by waiting on the SD card. Anything
+        the last period left unsaved stays in the buffer and goes to its own file on the next flush().
+        """
+        if self.count:
+            self.previous_period = self.period
+            self.previous_count = self.count
+        self.period = period
+
+    def flush(self) -> bool:
+        """Save everything recorded so far to the SD card, one file per period, then start over."""
+        if not self.count or not brain.sdcard.is_inserted():
+            return False
+        # the oldest sample is at head once the buffer has wrapped around
+        start = (self.head - self.count) % self.capacity
+        if self.previous_count:
+            self.save(self.previous_period, start, self.previous_count)
+            start = (start + self.previous_count) % self.capacity
+        if self.count > self.previous_count:
+            self.save(self.period, start, self.count - self.previous_count)
+        self.head = 0
+        self.count = 0
+        self.previous_count = 0
+        return True
+
+    def save(self, period: str, start: int, count: int):
+        """Write count samples starting at slot start to a new file, straight out of the buffer."""
+        header = bytearray(self.MAGIC)
+        for number in (len(self.fields), count, len(self.names)):
+            header += bytes((number & 0xFF, (number >> 8) & 0xFF))
+        header += self.names
+        while True:
+            self.saved += 1
+            filename = "{}_{}.tlm".format(period, self.saved)
+            if not brain.sdcard.exists(filename):
+                break
+        brain.sdcard.savefile(filename, header)
+        # memoryview slices point into the buffer, so the samples are never copied
+        samples = memoryview(self.buffer)
+        end = start + count
+        if end <= self.capacity:
+            brain.sdcard.appendfile(filename, samples[start * self.sample_size:end * self.sample_size])
+        else:
+            brain.sdcard.appendfile(filename, samples[start * self.sample_size:])
+            brain.sdcard.appendfile(filename, samples[:(end - self.capacity) * self.sample_size])
+
+
+telemetry = Telemetry(TELEMETRY_FIELDS, TELEMETRY_SAMPLES)
+# set by the controller button, the driver loop does the actual save so it never races the recorder
+telemetry_flush_requested: bool = False
+# how often the background thread checks whether the field has disabled the robot
+COMPETITION_POLL_MS: int = 50
+
+
+def record_telemetry(controller: Controller | None, timer: Timer):
+    """Add one sample for this tick (no controller in autonomous, the sticks are logged as 0)."""
+    telemetry.begin_sample()
+    # hundredths of a second roll over every 655 s, the decoder unrolls them
+    telemetry.put_wrapped(int(timer.time(MSEC)) // 10)
+    telemetry.put(controller.axis1.position() if controller else 0)
+    telemetry.put(controller.axis3.position() if controller else 0)
+    telemetry.put(right_output)
+    telemetry.put(left_output)
+    telemetry.put(suction_output)
+    for motor, sign in TELEMETRY_VELOCITIES:
+        telemetry.put(int(motor.velocity(PERCENT) * 10) * sign)
+    for motor in TELEMETRY_MOTORS:
+        telemetry.put(int(motor.current(CurrentUnits.AMP) * 1000))
+    telemetry.end_sample()
+
+
+def slew(current: int, target: int) -> int:
+    """Step from current toward target, speeding up by at most SLEW_RATE (and slowing down by DECEL_RATE)."""
+    # slowing down, maybe all the way through 0 into the other direction
+    if current > 0 and target < current:
+        if DECEL_RATE > 0 and target < current - DECEL_RATE:
+            return max(current - DECEL_RATE, 0)  # a reversal still stops at 0 first
+        if target >= 0:
+            return target
+        current = 0  # made it to 0 this tick, from here on it's speeding up in reverse
+    elif current < 0 and target > current:
+        if DECEL_RATE > 0 and target > current + DECEL_RATE:
+            return min(current + DECEL_RATE, 0)
+        if target <= 0:
+            return target
+        current = 0
+    # speeding up, away from 0
+    if SLEW_RATE <= 0:
+        return target
+    if target > current + SLEW_RATE:
+        return current + SLEW_RATE
+    if target < current - SLEW_RATE:
+        return current - SLEW_RATE
+    return target
+
 
 def command_move(x: int | float, y: int | float):
     """Command the robot to move in the two axises."""
@@ -41,61 +295,249 @@ def command_move(x: int | float, y: int | float):
         # let's scale it down
         right_speed = right_speed / max_input * 100 
         left_speed = left_speed / max_input * 100 
+    # whole percents are all the motors care about, and it makes repeats easy to spot
+    right_speed = round(right_speed)
+    left_speed = round(left_speed)
     
-    # now let's command the motors
+    global right_output, left_output
+    right_output = right_speed
+    left_output = left_speed
+
+    # now let's command the motors (command_motor skips any that are already at this speed)
     for right_motor in RIGHT_MOTORS:
         right_motor: Motor
-        right_motor.spin(FORWARD if not REVERSE_RIGHT else REVERSE, right_speed, PERCENT)
+        command_motor(right_motor, FORWARD if not REVERSE_RIGHT else REVERSE, right_speed)
     
     for left_motor in LEFT_MOTORS:
         left_motor: Motor
-        left_motor.spin(FORWARD if not REVERSE_LEFT else REVERSE, left_speed, PERCENT)
+        command_motor(left_motor, FORWARD if not REVERSE_LEFT else REVERSE, left_speed)
+
+
+def command_move_shaped(x: int, y: int):
+    """Like command_move, but through the response curves and slew limit."""
+    global right_output, left_output
+    turn = TURN_TABLE[x + 100]
+    drive = DRIVE_TABLE[y + 100]
+    right_target = drive - turn
+    left_target = drive + turn
+
+    # same sanity check as command_move, with a table lookup instead of a divide
+    right_size = right_target if right_target >= 0 else -right_target
+    left_size = left_target if left_target >= 0 else -left_target
+    biggest = right_size if right_size > left_size else left_size
+    if biggest > 100:
+        # scale the sizes and put the sign back after, so forward and reverse round the same way
+        right_size = (right_size * SCALE_TABLE[biggest] + SCALE_HALF) >> SCALE_BITS
+        left_size = (left_size * SCALE_TABLE[biggest] + SCALE_HALF) >> SCALE_BITS
+        right_target = right_size if right_target >= 0 else -right_size
+        left_target = left_size if left_target >= 0 else -left_size
+
+    right = slew(right_output, right_target)
+    left = slew(left_output, left_target)
+
+    # only talk to the motors when a side's speed actually changes
+    if right != right_output:
+        right_output = right
+        for right_motor in RIGHT_MOTORS:
+            command_motor(right_motor, RIGHT_DIRECTION, right)
+
+    if left != left_output:
+        left_output = left
+        for left_motor in LEFT_MOTORS:
+            command_motor(left_motor, LEFT_DIRECTION, left)
 
 
 def command_move_via_controller(controller: Controller):
     """Give movement commands via the controller."""
     # you could choose any axis you want, we chose these because we like how they feel while driving
+    global last_sticks
+    if USE_RESPONSE_CURVES:
+        # the tables already have the deadband built in
+        command_move_shaped(controller.axis1.position(), controller.axis3.position())
+        return
     # get the joystick positions
-    x = controller.axis1.position()
-    y = controller.axis3.position() 
+    x = apply_deadband(controller.axis1.position())
+    y = apply_deadband(controller.axis3.position())
+    # sticks haven't moved since last tick, the motors already have the right speeds
+    if (x, y) == last_sticks:
+        return
+    last_sticks = (x, y)
     # pass to the movement function
     command_move(x, y)
 
 
+def start_suction_motor():
+    """Start the suction motor on."""
+    global suction_output
+    suction_output = SUCTION_POWER
+    command_motor(SUCTION_MOTOR, FORWARD, SUCTION_POWER)
+
+
+def stop_suction_motor():
+    """Stop the suction motor."""
+    global suction_output
+    suction_output = 0
+    stop_motor(SUCTION_MOTOR)
+
+
 def driver_control():
     """Driver control function."""
+    global telemetry_flush_requested
+    # the motors were stopped while disabled, don't trust what we think they're doing
+    reset_motor_state()
     # create a controller object
     controller = Controller()
 
+    telemetry.start_period("driver")
     timer = Timer()
 
-    def start_suction_motor():
-        """Start the suction motor on."""
-        SUCTION_MOTOR.spin(FORWARD, SUCTION_POWER, PERCENT)
-    
-    def stop_suction_motor():
-        """Stop the suction motor."""
-        SUCTION_MOTOR.stop()
+    def request_telemetry_flush():
+        """Save the driver log at the end of a match or practice run."""
+        global telemetry_flush_requested
+        telemetry_flush_requested = True
     
     # set up button callbacks
     controller.buttonA.pressed(start_suction_motor)
     controller.buttonB.pressed(stop_suction_motor)
+    controller.buttonX.pressed(request_telemetry_flush)
 
     # loop forever
     while True:
         command_move_via_controller(controller)
-        wait(20, MSEC)  # don't hog the CPU
+        record_telemetry(controller, timer)
+        if telemetry_flush_requested:
+            telemetry_flush_requested = False
+            telemetry.flush()
+        wait(LOOP_DELAY_MS, MSEC)  # don't hog the CPU
+
+
+# autonomous runs every task one small step per tick, so mechanisms can work at the same time
+AUTON_TICK_MS: int = 10
+AUTON_LENGTH_MS: int = 15000  # the autonomous period is 15 seconds
+
+
+# ---- autonomous tasks ----
+# each task is a generator: it does a little work, then yields to let the other tasks have a turn.
+# the scheduler calls next() on every task once per tick until the task finishes.
+
+def wait_ms(ms: int):
+    """Do nothing for a while."""
+    end = brain.timer.time(MSEC) + ms
+    while brain.timer.time(MSEC) < end:
+        yield
+
+
+def wait_until(condition, timeout_ms: int | None = None):
+    """Wait until condition() is true (or the timeout runs out, if there is one)."""
+    end = None if timeout_ms is None else brain.timer.time(MSEC) + timeout_ms
+    while not condition():
+        if end is not None and brain.timer.time(MSEC) >= end:
+            return
+        yield
+
+
+def drive_for(x: int, y: int, ms: int):
+    """Drive with the arcade mix for a while, then stop."""
+    try:
+        command_move(x, y)
+        yield from wait_ms(ms)
+    finally:
+        # also runs if the period ends while we're still driving
+        command_move(0, 0)
+
+
+def suction_for(ms: int):
+    """Run the suction motor for a while, then stop it."""
+    try:
+        start_suction_motor()
+        yield from wait_ms(ms)
+    finally:
+        stop_suction_motor()
+
+
+def in_sequence(*tasks):
+    """Run tasks one after another."""
+    for task in tasks:
+        yield from task
+
+
+def in_parallel(*tasks):
+    """Run tasks side by side, finishes when all of them have."""
+    running = list(tasks)
+    try:
+        while running:
+            for task in running[:]:
+                try:
+                    next(task)
+                except StopIteration:
+                    running.remove(task)
+            if running:
+                yield
+    finally:
+        for task in running:
+            task.close()
+
+
+def drive_stopped() -> bool:
+    """True once every drive motor has (nearly) stopped turning."""
+    for motor in RIGHT_MOTORS + LEFT_MOTORS:
+        if abs(motor.velocity(PERCENT)) > 5:
+            return False
+    return True
+
+
+def run_autonomous(task, length_ms: int = AUTON_LENGTH_MS):
+    """Step task at a fixed rate until it finishes or the period runs out."""
+    timer = Timer()
+    next_tick = 0
+    try:
+        while timer.time(MSEC) < length_ms:
+            try:
+                next(task)
+            except StopIteration:
+                return
+            record_telemetry(None, timer)
+            # wait out the rest of the tick, so the rate stays fixed no matter how long the work took
+            next_tick += AUTON_TICK_MS
+            remaining = next_tick - timer.time(MSEC)
+            if remaining > 0:
+                wait(remaining, MSEC)
+    finally:
+        task.close()  # anything still running gets to stop its motors
 
 
 def autonomous():
     """Autonomous function."""
-    # example autonomous code
-    command_move(0, 50)  # move forward at 50% speed
-    wait(2, SECONDS)     # for 2 seconds
-    command_move(0, 0)   # stop
+    reset_motor_state()
+    telemetry.start_period("auton")
+    # example autonomous code, the drive and the suction run at the same time
+    run_autonomous(in_parallel(
+        in_sequence(
+            drive_for(0, 50, 2000),          # move forward at 50% speed for 2 seconds
+            wait_until(drive_stopped, 500),  # give it up to half a second to actually stop
+        ),
+        suction_for(2500),                   # pull in anything we drive over on the way
+    ))
+
+
+def save_telemetry_when_disabled():
+    """Background thread: save the log as soon as a period ends.
+
+    When the field disables the robot VEXos stops the driver/autonomous thread, so nothing
+    else is left running to do it, and nothing is recording anymore so the flush can't race it.
+    """
+    was_enabled = competition.is_enabled()
+    while True:
+        enabled = competition.is_enabled()
+        if was_enabled and not enabled:
+            telemetry.flush()
+        was_enabled = enabled
+        wait(COMPETITION_POLL_MS, MSEC)
+
 
+# setup the competition instance
+competition = Competition(driver_control, autonomous)
+telemetry_thread = Thread(save_telemetry_when_disabled)
 
 if __name__ == "__main__":
-    # setup the competition instance
-    Competition(driver_control, autonomous)
     driver_control()  # run driver control by default
\ No newline at end of file
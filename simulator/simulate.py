@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Run robot code on the desktop against the stand-in vex module and time its loop."""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import importlib.util
+import logging
+import os
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional
+
+SIMULATOR_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SIMULATOR_DIR.parent
+DEFAULT_PROGRAM = REPO_ROOT / "resources" / "October" / "Entry" / "Final Push for Competition" / "main.py"
+DEFAULT_BUDGET_MS = 20.0
+AUTONOMOUS_MS = 15_000
+
+if str(SIMULATOR_DIR) not in sys.path:
+  sys.path.insert(0, str(SIMULATOR_DIR))
+
+import vex  # noqa: E402  (must resolve to the stand-in next to this file)
+from traces import BUILTIN_TRACES, Trace, get_trace  # noqa: E402
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+  logging.basicConfig(level=os.environ.get("SIM_LOG_LEVEL", "INFO"), format="[%(levelname)s] %(message)s")
+  log = logging.getLogger("simulator")
+
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--program", type=Path, default=DEFAULT_PROGRAM,
+                      help="Robot main.py to load (default: %(default)s)")
+  parser.add_argument("--trace", default="match",
+                      help=f"Built-in trace ({', '.join(BUILTIN_TRACES)}) or path to a JSON trace (default: %(default)s)")
+  parser.add_argument("--mode", choices=("driver", "autonomous"), default="driver",
+                      help="Which competition period to run (default: %(default)s)")
+  parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                      help="Loop tick budget to compare iteration cost against (default: %(default)s)")
+  parser.add_argument("--repeat", type=int, default=5,
+                      help="Runs to pool for timing statistics (default: %(default)s)")
+  parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                      help="Override a program global after import, e.g. USE_RESPONSE_CURVES=False (repeatable)")
+  parser.add_argument("--sd-dir", type=Path,
+                      help="Write files the program saved to the simulated SD card into this directory")
+  parser.add_argument("--cpu-scale", type=float,
+                      help="How many times slower the brain runs the loop than this machine (time one loop on the "
+                           "brain and divide by the desktop mean); applied before comparing against the budget")
+  parser.add_argument("--strict", action="store_true",
+                      help="Exit non-zero if any scaled iteration exceeds the budget (needs --cpu-scale)")
+  args = parser.parse_args(list(argv) if argv is not None else None)
+  if args.cpu_scale is not None and args.cpu_scale <= 0:
+    parser.error("--cpu-scale must be positive")
+  if args.strict and args.cpu_scale is None:
+    parser.error("--strict needs --cpu-scale; desktop timings say nothing about the brain's budget")
+
+  trace = get_trace(args.trace) if args.mode == "driver" else None
+  overrides = parse_overrides(args.overrides)
+  results = [run(args.program, trace, mode=args.mode, overrides=overrides) for _ in range(max(1, args.repeat))]
+  result = SimResult.merge(results)
+  report(result, args.budget_ms, args.cpu_scale, log)
+
+  if args.sd_dir:
+    args.sd_dir.mkdir(parents=True, exist_ok=True)
+    for name, data in result.sd_files.items():
+      (args.sd_dir / name).write_bytes(data)
+      log.info("Wrote SD card file %s (%.1f KB)", args.sd_dir / name, len(data) / 1024)
+
+  if args.strict and result.overruns(args.budget_ms, args.cpu_scale):
+    return 1
+  return 0
+
+
+@dataclass
+class SimResult:
+  program: Path
+  trace: str
+  mode: str
+  sim_ms: float
+  iteration_ns: List[int]
+  callback_ns: int
+  spin_calls: Dict[int, int]
+  commands: Dict[int, List[tuple]]
+  screen: List[str]
+  sd_files: Dict[str, bytes]
+  runs: int = 1
+
+  @property
+  def iterations(self) -> int:
+    return len(self.iteration_ns)
+
+  def overruns(self, budget_ms: float, cpu_scale: float = 1.0) -> int:
+    """Iterations over budget once their desktop cost is scaled up to the brain's."""
+    limit = budget_ms * 1_000_000 / cpu_scale
+    return sum(1 for ns in self.iteration_ns if ns > limit)
+
+  @staticmethod
+  def merge(results: List["SimResult"]) -> "SimResult":
+    first = results[0]
+    pooled: List[int] = []
+    for result in results:
+      pooled.extend(result.iteration_ns)
+    return SimResult(
+        program=first.program,
+        trace=first.trace,
+        mode=first.mode,
+        sim_ms=first.sim_ms,
+        iteration_ns=pooled,
+        callback_ns=sum(r.callback_ns for r in results) // len(results),
+        spin_calls=first.spin_calls,
+        commands=first.commands,
+        screen=first.screen,
+        sd_files=first.sd_files,
+        runs=len(results),
+    )
+
+
+def load_program(path: Path) -> ModuleType:
+  """Import a robot program without running its ``__main__`` block."""
+  spec = importlib.util.spec_from_file_location("robot_program", path)
+  if spec is None or spec.loader is None:
+    raise FileNotFoundError(f"Cannot load robot program at {path}")
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
+def parse_overrides(pairs: Iterable[str]) -> Dict[str, Any]:
+  overrides: Dict[str, Any] = {}
+  for pair in pairs:
+    name, sep, raw = pair.partition("=")
+    if not sep or not name.strip():
+      raise ValueError(f"Override {pair!r} must look like NAME=VALUE")
+    try:
+      value = ast.literal_eval(raw.strip())
+    except (ValueError, SyntaxError):
+      value = raw.strip()
+    overrides[name.strip()] = value
+  return overrides
+
+
+def run(program_path: Path, trace: Optional[Trace], mode: str = "driver",
+        overrides: Optional[Dict[str, Any]] = None) -> SimResult:
+  """Load ``program_path`` fresh and play ``trace`` into its driver or autonomous function.
+
+  ``overrides`` are assigned onto the program module after import, so they
+  only affect globals the program reads at call time (not tables it built
+  while importing).
+  """
+  if mode == "autonomous":
+    vex.simulation.reset(trace, duration_ms=AUTONOMOUS_MS)
+  else:
+    vex.simulation.reset(trace)
+  program = load_program(program_path)
+  for name, value in (overrides or {}).items():
+    if not hasattr(program, name):
+      raise AttributeError(f"{program_path.name} has no global named {name!r}")
+    setattr(program, name, value)
+  entry = getattr(program, "autonomous" if mode == "autonomous" else "driver_control")
+
+  vex.simulation.begin()
+  try:
+    entry()
+  except vex.SimulationComplete:
+    pass
+  sim_ms = vex.simulation.now_ms
+  # the period is over: the field disables the robot, which background threads may react to
+  vex.simulation.disable()
+
+  sim = vex.simulation
+  return SimResult(
+      program=program_path,
+      trace=trace.name if trace else "none",
+      mode=mode,
+      sim_ms=sim_ms,
+      iteration_ns=list(sim.iteration_ns),
+      callback_ns=sim.callback_ns,
+      spin_calls={motor.port + 1: motor.spin_calls for motor in sim.motors},
+      commands={motor.port + 1: list(motor.commands) for motor in sim.motors},
+      screen=list(sim.screen_lines),
+      sd_files=dict(sim.sd_files),
+  )
+
+
+def report(result: SimResult, budget_ms: float, cpu_scale: Optional[float], log: logging.Logger) -> None:
+  log.info("%s (%s, trace %s): %.1f s simulated, %d loop iterations",
+           result.program.name, result.mode, result.trace, result.sim_ms / 1000, result.iterations)
+  if not result.iteration_ns:
+    log.info("No loop iterations recorded.")
+    return
+
+  costs_us = sorted(ns / 1000 for ns in result.iteration_ns)
+  mean_us = statistics.fmean(costs_us)
+  jitter_us = statistics.pstdev(costs_us)
+  log.info("Desktop iteration cost: mean %.1f us, p50 %.1f us, p95 %.1f us, p99 %.1f us, max %.1f us; jitter (stddev) %.1f us",
+           mean_us, percentile(costs_us, 50), percentile(costs_us, 95), percentile(costs_us, 99), costs_us[-1], jitter_us)
+  if cpu_scale is None:
+    log.info("These are CPython timings, only comparable between runs on this machine; "
+             "pass --cpu-scale to check them against the %.0f ms budget", budget_ms)
+  else:
+    log.info("Scaled x%g to the brain: mean %.2f ms, max %.2f ms; %.1f%% of the %.0f ms budget on average, %d overruns",
+             cpu_scale, mean_us * cpu_scale / 1000, costs_us[-1] * cpu_scale / 1000,
+             mean_us * cpu_scale / (budget_ms * 10), budget_ms, result.overruns(budget_ms, cpu_scale))
+  log.info("Controller updates and button callbacks: %.1f us per run", result.callback_ns / 1000)
+  total_spins = sum(result.spin_calls.values())
+  per_run_iterations = max(1, result.iterations // result.runs)
+  log.info("Motor commands: %d per run (%.1f per iteration); by port %s",
+           total_spins, total_spins / per_run_iterations, result.spin_calls)
+  log.info("Largest single change in commanded speed (%%) by port: %s", largest_steps(result.commands))
+
+
+def largest_steps(commands: Dict[int, List[tuple]]) -> Dict[int, float]:
+  steps: Dict[int, float] = {}
+  for port, history in commands.items():
+    previous = 0.0
+    step = 0.0
+    for _, pct in history:
+      step = max(step, abs(pct - previous))
+      previous = pct
+    steps[port] = round(step)
+  return steps
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+  if not sorted_values:
+    return 0.0
+  idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+  return sorted_values[idx]
+
+
+if __name__ == "__main__":
+  raise SystemExit(main())
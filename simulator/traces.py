@@ -0,0 +1,162 @@
+"""Scripted controller input for the simulator.
+
+A trace is a list of keyframes (time, four stick axes, held buttons). Between
+keyframes the axes either hold their value or ramp linearly; buttons always
+hold. Traces can be built in code, picked from BUILTIN_TRACES by name, or
+loaded from JSON:
+
+  {"duration_ms": 4000, "interpolate": true,
+   "frames": [{"t": 0, "axis3": 0}, {"t": 1000, "axis3": 100, "buttons": ["A"]}]}
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+Axes = Tuple[int, int, int, int]
+
+
+@dataclass
+class Keyframe:
+  t_ms: float
+  axes: Axes = (0, 0, 0, 0)
+  buttons: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class Trace:
+  name: str
+  frames: List[Keyframe]
+  interpolate: bool = False
+  duration_ms: float = 0.0
+  _times: List[float] = field(init=False, repr=False)
+
+  def __post_init__(self) -> None:
+    if not self.frames:
+      raise ValueError(f"Trace {self.name!r} has no frames")
+    self.frames.sort(key=lambda frame: frame.t_ms)
+    self._times = [frame.t_ms for frame in self.frames]
+    self.duration_ms = max(self.duration_ms, self._times[-1])
+
+  def state_at(self, t_ms: float) -> Tuple[Axes, FrozenSet[str]]:
+    idx = max(0, bisect.bisect_right(self._times, t_ms) - 1)
+    frame = self.frames[idx]
+    if not self.interpolate or idx + 1 >= len(self.frames) or t_ms <= frame.t_ms:
+      return frame.axes, frame.buttons
+    nxt = self.frames[idx + 1]
+    frac = (t_ms - frame.t_ms) / (nxt.t_ms - frame.t_ms)
+    axes = tuple(int(round(a + (b - a) * frac)) for a, b in zip(frame.axes, nxt.axes))
+    return axes, frame.buttons  # type: ignore[return-value]
+
+
+def load_trace(path: Path) -> Trace:
+  data = json.loads(Path(path).read_text(encoding="utf-8"))
+  frames = []
+  for raw in data.get("frames", []):
+    axes = tuple(clamp_axis(raw.get(f"axis{n}", 0)) for n in range(1, 5))
+    frames.append(Keyframe(float(raw.get("t", 0)), axes, frozenset(raw.get("buttons", []))))  # type: ignore[arg-type]
+  return Trace(
+      name=data.get("name") or Path(path).stem,
+      frames=frames,
+      interpolate=bool(data.get("interpolate", False)),
+      duration_ms=float(data.get("duration_ms", 0)),
+  )
+
+
+def get_trace(name_or_path: str) -> Trace:
+  factory = BUILTIN_TRACES.get(name_or_path)
+  if factory:
+    return factory()
+  path = Path(name_or_path)
+  if path.exists():
+    return load_trace(path)
+  raise ValueError(f"Unknown trace {name_or_path!r}; expected a JSON file or one of {', '.join(BUILTIN_TRACES)}")
+
+
+def clamp_axis(value: float) -> int:
+  return max(-100, min(100, int(round(value))))
+
+
+def sticks(x: float = 0, y: float = 0) -> Axes:
+  """Arcade layout used by our drive code: axis1 turns, axis3 drives."""
+  return (clamp_axis(x), 0, clamp_axis(y), 0)
+
+
+def idle_trace() -> Trace:
+  return Trace("idle", [Keyframe(0), Keyframe(5000)])
+
+
+def straight_trace() -> Trace:
+  return Trace("straight", [
+      Keyframe(0, sticks()),
+      Keyframe(1000, sticks(y=100)),
+      Keyframe(3000, sticks(y=100)),
+      Keyframe(3500, sticks()),
+      Keyframe(5000, sticks()),
+  ], interpolate=True)
+
+
+def sweep_trace() -> Trace:
+  """Both sticks moving every tick: the worst case for change-driven logic."""
+  frames = [
+      Keyframe(t, sticks(100 * math.sin(t / 700.0), 100 * math.cos(t / 1100.0)))
+      for t in range(0, 10_001, 20)
+  ]
+  return Trace("sweep", frames)
+
+
+def suction_trace() -> Trace:
+  return Trace("suction", [
+      Keyframe(0, sticks()),
+      Keyframe(1000, sticks(), frozenset({"A"})),
+      Keyframe(1100, sticks(y=60)),
+      Keyframe(2500, sticks()),
+      Keyframe(3000, sticks(), frozenset({"B"})),
+      Keyframe(3100, sticks()),
+      Keyframe(4000, sticks()),
+  ], interpolate=True)
+
+
+def match_trace(seed: int = 5840) -> Trace:
+  """A 1:45 driver period: stick moves separated by holds, plus intake toggles.
+
+  The driver lets go of the sticks just before the period ends.
+  """
+  rng = random.Random(seed)
+  frames = [Keyframe(0, sticks())]
+  t = 0.0
+  suction_on = False
+  while t < 105_000:
+    t += rng.choice((200, 400, 600, 1000))
+    if rng.random() < 0.1:
+      button = "B" if suction_on else "A"
+      suction_on = not suction_on
+      frames.append(Keyframe(t, frames[-1].axes, frozenset({button})))
+      t += 100
+      frames.append(Keyframe(t, frames[-1].axes))
+      continue
+    if rng.random() < 0.3:
+      target = sticks()
+    else:
+      target = sticks(rng.uniform(-60, 60), rng.uniform(-100, 100))
+    # Ramp to the new position, then hold it.
+    frames.append(Keyframe(t, frames[-1].axes))
+    t += rng.choice((100, 200, 300))
+    frames.append(Keyframe(t, target))
+  frames.append(Keyframe(t + 200, sticks()))
+  return Trace("match", frames, interpolate=True, duration_ms=t + 600)
+
+
+BUILTIN_TRACES: Dict[str, Callable[[], Trace]] = {
+    "idle": idle_trace,
+    "straight": straight_trace,
+    "sweep": sweep_trace,
+    "suction": suction_trace,
+    "match": match_trace,
+}
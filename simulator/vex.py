@@ -0,0 +1,395 @@
+"""Desktop stand-in for the VEX V5 Python ``vex`` module.
+
+Only the parts of the API our robot programs use are modelled. Time is
+virtual: wait() advances the simulated clock instead of sleeping, applies the
+next controller state from the active trace and records how long the robot
+code ran since the previous wait() so simulate.py can hold it against the
+loop budget. Thread callbacks run in lock step with that clock: each one only
+runs while the main program is parked in wait(), until its own next wait().
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+__all__ = [
+    "Brain", "Competition", "Controller", "Motor", "Thread", "Timer", "wait",
+    "Ports", "DirectionType", "VelocityUnits", "TimeUnits", "CurrentUnits",
+    "BrakeType", "ControllerType", "GearSetting",
+    "FORWARD", "REVERSE", "PERCENT", "RPM", "MSEC", "SECONDS", "SEC", "AMP",
+    "COAST", "BRAKE", "HOLD", "PRIMARY", "PARTNER",
+]
+
+
+class DirectionType:
+  FORWARD = "FORWARD"
+  REVERSE = "REVERSE"
+
+
+class VelocityUnits:
+  PERCENT = "PERCENT"
+  RPM = "RPM"
+
+
+class TimeUnits:
+  MSEC = "MSEC"
+  SECONDS = "SECONDS"
+  SEC = "SECONDS"
+
+
+class CurrentUnits:
+  AMP = "AMP"
+
+
+class BrakeType:
+  COAST = "COAST"
+  BRAKE = "BRAKE"
+  HOLD = "HOLD"
+
+
+class ControllerType:
+  PRIMARY = "PRIMARY"
+  PARTNER = "PARTNER"
+
+
+class GearSetting:
+  RATIO_36_1 = 100
+  RATIO_18_1 = 200
+  RATIO_6_1 = 600
+
+
+class Ports:
+  pass
+
+
+for _port in range(1, 22):
+  setattr(Ports, f"PORT{_port}", _port - 1)
+
+FORWARD = DirectionType.FORWARD
+REVERSE = DirectionType.REVERSE
+PERCENT = VelocityUnits.PERCENT
+RPM = VelocityUnits.RPM
+MSEC = TimeUnits.MSEC
+SECONDS = TimeUnits.SECONDS
+SEC = TimeUnits.SEC
+AMP = CurrentUnits.AMP
+COAST = BrakeType.COAST
+BRAKE = BrakeType.BRAKE
+HOLD = BrakeType.HOLD
+PRIMARY = ControllerType.PRIMARY
+PARTNER = ControllerType.PARTNER
+
+# Rough V5 smart motor response: first-order lag toward the commanded speed.
+MOTOR_TIME_CONSTANT_MS = 80.0
+MOTOR_STALL_CURRENT_A = 2.5
+MOTOR_FREE_CURRENT_A = 0.1
+
+
+class SimulationComplete(Exception):
+  """Raised from wait() once the active trace has been played out."""
+
+
+def _to_ms(value: float, units: str) -> float:
+  return value * 1000.0 if units == SECONDS else float(value)
+
+
+class Simulation:
+  """Virtual clock, device registry and loop timing for one simulated run."""
+
+  def __init__(self) -> None:
+    self.reset()
+
+  def reset(self, trace: Any = None, duration_ms: Optional[float] = None) -> None:
+    for thread in list(getattr(self, "threads", [])):
+      thread._stop()
+    self.threads: List[Thread] = []
+    self.enabled = True
+    self.now_ms = 0.0
+    self.trace = trace
+    if duration_ms is None and trace is not None:
+      duration_ms = trace.duration_ms
+    self.end_ms = duration_ms
+    self.motors: List[Motor] = []
+    self.controllers: List[Controller] = []
+    self.competition: Optional[Competition] = None
+    self.screen_lines: List[str] = []
+    self.sd_files: Dict[str, bytes] = {}
+    self.iteration_ns: List[int] = []
+    self.callback_ns = 0
+    self._mark: Optional[int] = None
+    if trace is not None:
+      self._apply_controller_state()
+
+  def begin(self) -> None:
+    """Start timing; the first iteration runs from here to the first wait()."""
+    self._mark = time.perf_counter_ns()
+
+  def wait(self, ms: float) -> None:
+    thread = getattr(_current, "thread", None)
+    if thread is not None:
+      thread._sleep(ms)
+      return
+    if self._mark is not None:
+      self.iteration_ns.append(time.perf_counter_ns() - self._mark)
+    self.advance(ms)
+    self._mark = time.perf_counter_ns()
+
+  def advance(self, ms: float) -> None:
+    for motor in self.motors:
+      motor._step(ms)
+    self.now_ms += ms
+    if self.end_ms is not None and self.now_ms >= self.end_ms:
+      raise SimulationComplete()
+    self._apply_controller_state()
+    for thread in list(self.threads):
+      if thread._wake_ms <= self.now_ms:
+        thread._resume()
+
+  def disable(self, ms: float = 200.0) -> None:
+    """End the period like the field does: disable the robot and let background threads react."""
+    self.enabled = False
+    self.end_ms = None
+    for _ in range(int(ms // 10)):
+      self.advance(10)
+
+  def _apply_controller_state(self) -> None:
+    if self.trace is None:
+      return
+    axes, buttons = self.trace.state_at(self.now_ms)
+    start = time.perf_counter_ns()
+    for controller in self.controllers:
+      controller._apply(axes, buttons)
+    self.callback_ns += time.perf_counter_ns() - start
+
+
+_current = threading.local()
+simulation = Simulation()
+
+
+class _Screen:
+  def print(self, *values: Any, sep: str = " ") -> None:
+    simulation.screen_lines.append(sep.join(str(v) for v in values))
+
+  def clear_screen(self, *args: Any) -> None:
+    simulation.screen_lines.clear()
+
+  def set_cursor(self, row: int, col: int) -> None:
+    pass
+
+  def new_line(self) -> None:
+    pass
+
+
+class _SDCard:
+  """SD card backed by ``simulation.sd_files``; simulate.py can write them to disk afterwards."""
+
+  def is_inserted(self) -> bool:
+    return True
+
+  def exists(self, filename: str) -> bool:
+    return filename in simulation.sd_files
+
+  def filesize(self, filename: str) -> int:
+    return len(simulation.sd_files.get(filename, b""))
+
+  def loadfile(self, filename: str) -> bytearray:
+    return bytearray(simulation.sd_files.get(filename, b""))
+
+  def savefile(self, filename: str, data: Any) -> int:
+    simulation.sd_files[filename] = bytes(data)
+    return len(data)
+
+  def appendfile(self, filename: str, data: Any) -> int:
+    simulation.sd_files[filename] = simulation.sd_files.get(filename, b"") + bytes(data)
+    return len(data)
+
+
+class Thread:
+  """Runs callback on a real thread, but only ever one of it or the main program at a time."""
+
+  def __init__(self, callback: Callable[..., None], args: tuple = ()) -> None:
+    self._wake_ms = simulation.now_ms
+    self._stopping = False
+    self._done = False
+    self._go = threading.Semaphore(0)
+    self._parked = threading.Semaphore(0)
+    simulation.threads.append(self)
+    threading.Thread(target=self._run, args=(callback, args), daemon=True).start()
+    self._parked.acquire()  # runs up to its first wait() right away
+
+  def stop(self) -> None:
+    self._stop()
+
+  def _run(self, callback: Callable[..., None], args: tuple) -> None:
+    _current.thread = self
+    try:
+      callback(*args)
+    except SimulationComplete:
+      pass
+    finally:
+      self._done = True
+      if self in simulation.threads:
+        simulation.threads.remove(self)
+      self._parked.release()
+
+  def _sleep(self, ms: float) -> None:
+    self._wake_ms = simulation.now_ms + ms
+    self._parked.release()
+    self._go.acquire()
+    if self._stopping:
+      raise SimulationComplete()
+
+  def _resume(self) -> None:
+    self._go.release()
+    self._parked.acquire()
+
+  def _stop(self) -> None:
+    if not self._done:
+      self._stopping = True
+      self._resume()
+
+
+class Timer:
+  def __init__(self) -> None:
+    self._start_ms = simulation.now_ms
+
+  def time(self, units: str = MSEC) -> float:
+    elapsed = simulation.now_ms - self._start_ms
+    return elapsed / 1000.0 if units == SECONDS else elapsed
+
+  def value(self) -> float:
+    return self.time(SECONDS)
+
+  def clear(self) -> None:
+    self._start_ms = simulation.now_ms
+
+  def reset(self) -> None:
+    self.clear()
+
+
+class Brain:
+  def __init__(self) -> None:
+    self.screen = _Screen()
+    self.sdcard = _SDCard()
+    self.timer = Timer()
+
+
+class Motor:
+  def __init__(self, port: int, *args: Any) -> None:
+    self.port = port
+    self.max_rpm = GearSetting.RATIO_18_1
+    self.reversed = False
+    for arg in args:
+      if isinstance(arg, bool):
+        self.reversed = arg
+      elif isinstance(arg, int):
+        self.max_rpm = arg
+    self._default_pct = 50.0
+    self._target_pct = 0.0
+    self._velocity_pct = 0.0
+    self.spin_calls = 0
+    self.commands: List[tuple] = []
+    simulation.motors.append(self)
+
+  def spin(self, direction: str, velocity: Optional[float] = None, units: str = PERCENT) -> None:
+    pct = self._default_pct if velocity is None else self._to_pct(velocity, units)
+    if direction == REVERSE:
+      pct = -pct
+    self.spin_calls += 1
+    self._command(pct)
+
+  def stop(self, mode: Optional[str] = None) -> None:
+    self.spin_calls += 1
+    self._command(0.0)
+
+  def set_velocity(self, velocity: float, units: str = PERCENT) -> None:
+    self._default_pct = self._to_pct(velocity, units)
+
+  def velocity(self, units: str = PERCENT) -> float:
+    value = -self._velocity_pct if self.reversed else self._velocity_pct
+    return value * self.max_rpm / 100.0 if units == RPM else value
+
+  def current(self, units: str = AMP) -> float:
+    slip = abs(self._target_pct - self._velocity_pct) / 100.0
+    return min(MOTOR_STALL_CURRENT_A, MOTOR_FREE_CURRENT_A + slip * MOTOR_STALL_CURRENT_A)
+
+  def _to_pct(self, velocity: float, units: str) -> float:
+    pct = velocity * 100.0 / self.max_rpm if units == RPM else float(velocity)
+    return max(-100.0, min(100.0, pct))
+
+  def _command(self, pct: float) -> None:
+    if pct != self._target_pct or not self.commands:
+      self.commands.append((simulation.now_ms, pct))
+    self._target_pct = pct
+
+  def _step(self, ms: float) -> None:
+    alpha = min(1.0, ms / MOTOR_TIME_CONSTANT_MS)
+    self._velocity_pct += (self._target_pct - self._velocity_pct) * alpha
+
+
+class _Axis:
+  def __init__(self) -> None:
+    self._position = 0
+
+  def position(self) -> int:
+    return self._position
+
+
+class _Button:
+  def __init__(self) -> None:
+    self._down = False
+    self._on_pressed: List[Callable[[], None]] = []
+    self._on_released: List[Callable[[], None]] = []
+
+  def pressed(self, callback: Callable[[], None]) -> None:
+    self._on_pressed.append(callback)
+
+  def released(self, callback: Callable[[], None]) -> None:
+    self._on_released.append(callback)
+
+  def pressing(self) -> bool:
+    return self._down
+
+  def _set(self, down: bool) -> None:
+    if down == self._down:
+      return
+    self._down = down
+    for callback in (self._on_pressed if down else self._on_released):
+      callback()
+
+
+BUTTON_NAMES = ("A", "B", "X", "Y", "Up", "Down", "Left", "Right", "L1", "L2", "R1", "R2")
+
+
+class Controller:
+  def __init__(self, kind: str = PRIMARY) -> None:
+    self.kind = kind
+    self.axis1 = _Axis()
+    self.axis2 = _Axis()
+    self.axis3 = _Axis()
+    self.axis4 = _Axis()
+    for name in BUTTON_NAMES:
+      setattr(self, f"button{name}", _Button())
+    simulation.controllers.append(self)
+    simulation._apply_controller_state()
+
+  def _apply(self, axes: tuple, buttons: frozenset) -> None:
+    self.axis1._position, self.axis2._position, self.axis3._position, self.axis4._position = axes
+    for name in BUTTON_NAMES:
+      getattr(self, f"button{name}")._set(name in buttons)
+
+
+class Competition:
+  def __init__(self, driver_control: Callable[[], None], autonomous: Callable[[], None]) -> None:
+    self.driver_control = driver_control
+    self.autonomous = autonomous
+    simulation.competition = self
+
+  def is_enabled(self) -> bool:
+    return simulation.enabled
+
+
+def wait(duration: float, units: str = MSEC) -> None:
+  simulation.wait(_to_ms(duration, units))
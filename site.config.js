@@ -3,3 +3,5 @@ window.REPO_OWNER = "m-jeide";
 window.REPO_NAME  = "5840C";
 window.REPO_BRANCH = "main";      
 window.CLASSES = ["August", "September", "October"];
+// Set to the published bundle folder (e.g. "compilation/output/bundles/") to load entries from packed bundles
+window.ENTRY_BUNDLES = "";